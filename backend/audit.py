@@ -1,22 +1,56 @@
 import datetime as dt
 
+from sqlalchemy import event
+from sqlalchemy.orm.attributes import flag_dirty
+
+from .db import SessionLocal
 from .evidence import mask_pii
 from .models import AuditEvent
 
 
+def audit_row(case_id, event_type, payload):
+    return {
+        "case_id": case_id,
+        "event_type": event_type,
+        "timestamp": dt.datetime.utcnow(),
+        "payload": mask_pii(payload),
+    }
+
+
 def log_event(session, case_id, event_type, payload):
-    masked_payload = mask_pii(payload)
-    event = AuditEvent(
-        case_id=case_id,
-        event_type=event_type,
-        timestamp=dt.datetime.utcnow(),
-        payload=masked_payload,
-    )
+    event = AuditEvent(**audit_row(case_id, event_type, payload))
     session.add(event)
     session.commit()
     return event
 
 
+def queue_event(case_obj, event_type, payload):
+    """Stage an audit event on the case; it is inserted by the next flush."""
+    pending = getattr(case_obj, "_pending_audit", None)
+    if pending is None:
+        pending = case_obj._pending_audit = []
+    pending.append(audit_row(case_obj.id, event_type, payload))
+    # Keep the case in session.dirty even if none of its columns change (e.g. a
+    # run failing part-way); otherwise commit() skips the flush and the queue.
+    flag_dirty(case_obj)
+
+
+@event.listens_for(SessionLocal, "before_flush")
+def _flush_pending_audit(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        pending = getattr(obj, "_pending_audit", None)
+        if pending:
+            session.add_all([AuditEvent(**row) for row in pending])
+            pending.clear()
+
+
+def log_events_bulk(session, rows):
+    """Insert pre-built audit rows (see ``audit_row``) in a single statement."""
+    if rows:
+        session.bulk_insert_mappings(AuditEvent, rows)
+        session.commit()
+
+
 def get_audit_timeline(session, case_id):
     events = (
         session.query(AuditEvent)
@@ -7,7 +7,12 @@ DATA_DIR = BASE_DIR / "data"
 DB_URL = os.getenv("DB_URL", f"sqlite:///{(BASE_DIR / 'sar.db').as_posix()}")
 
 CHROMA_DIR = os.getenv("CHROMA_DIR", str(DATA_DIR / "chroma"))
+# Set CHROMA_HOST to use a standalone Chroma server instead of the embedded store
+CHROMA_HOST = os.getenv("CHROMA_HOST") or None
+CHROMA_PORT = int(os.getenv("CHROMA_PORT", "8001"))
 CORPUS_DIR = os.getenv("CORPUS_DIR", str(DATA_DIR / "corpus"))
+# None lets sentence-transformers pick cuda/mps/cpu automatically
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE") or None
 
 OLLAMA_URL = os.getenv("OLLAMA_URL", "http://localhost:11434/api/generate")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.1")
@@ -15,6 +20,14 @@ USE_MOCK_LLM = os.getenv("USE_MOCK_LLM", "false").lower() == "true"
 
 TOP_K = int(os.getenv("TOP_K", "4"))
 
+# Semantic query cache in front of Chroma: entries kept, and the cosine
+# similarity above which a previous query's results are reused
+RAG_CACHE_SIZE = int(os.getenv("RAG_CACHE_SIZE", "512"))
+RAG_CACHE_THRESHOLD = float(os.getenv("RAG_CACHE_THRESHOLD", "0.95"))
+
+# Alerts processed concurrently by /batch-ingest (roughly Ollama's parallelism)
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))
+
 PROHIBITED_PHRASES = [
     "definitely", "certainly", "guaranteed", "must be", "obvious", "clearly",
     "terrorist", "criminal",
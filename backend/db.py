@@ -1,13 +1,38 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from . import jsonutil
 from .config import DB_URL
 
-engine = create_engine(DB_URL, connect_args={"check_same_thread": False})
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+engine = create_engine(
+    DB_URL,
+    connect_args={"check_same_thread": False},
+    json_serializer=lambda obj: jsonutil.dumps(obj).decode(),
+    json_deserializer=jsonutil.loads,
+)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
 Base = declarative_base()
 
 
+if DB_URL.startswith("sqlite"):
+    @event.listens_for(engine, "connect")
+    def _sqlite_pragmas(dbapi_conn, _):
+        # WAL + NORMAL sync: one fsync per checkpoint instead of two per commit
+        cur = dbapi_conn.cursor()
+        cur.execute("PRAGMA journal_mode=WAL")
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA mmap_size=268435456")
+        cur.close()
+
+
 def init_db():
     from . import models  # noqa: F401
     Base.metadata.create_all(bind=engine)
+    # create_all skips tables that already exist; add any newer indexes to them
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    # Superseded by the (case_id, timestamp) composite index
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS ix_audit_events_case_id"))
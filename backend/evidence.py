@@ -1,10 +1,12 @@
 import copy
 import datetime as dt
 
-PII_FIELDS = {
+import orjson
+
+PII_FIELDS = frozenset({
     "name", "customer_name", "account_number", "customer_id", "address",
     "email", "phone", "dob",
-}
+})
 
 
 def _mask_value(value):
@@ -17,43 +19,54 @@ def _mask_value(value):
 
 
 def mask_pii(obj):
-    if isinstance(obj, dict):
-        out = {}
-        for k, v in obj.items():
-            if k in PII_FIELDS:
-                out[k] = _mask_value(v)
-            else:
-                out[k] = mask_pii(v)
-        return out
-    if isinstance(obj, list):
-        return [mask_pii(i) for i in obj]
+    """Return a copy of ``obj`` with PII fields masked at any nesting depth."""
+    if type(obj) is not dict and type(obj) is not list:
+        return obj
+    obj = copy.deepcopy(obj)
+    stack = [obj]
+    while stack:
+        cur = stack.pop()
+        if type(cur) is dict:
+            for k, v in cur.items():
+                if k in PII_FIELDS:
+                    cur[k] = _mask_value(v)
+                elif type(v) is dict or type(v) is list:
+                    stack.append(v)
+        else:
+            stack.extend(i for i in cur if type(i) is dict or type(i) is list)
     return obj
 
 
 def build_decision_dataset(alert):
     customer = alert.get("customer", {})
-    txns = alert.get("transactions", [])
 
-    for txn in txns:
+    # Single pass: parse timestamps and accumulate every aggregate together.
+    # Each txn is shallow-copied so parsed timestamps never leak back into the
+    # caller's alert (it is persisted as-is on the pending Case row).
+    txns = []
+    start_ts = end_ts = None
+    total_amount = 0
+    counterparties = set()
+    for txn in alert.get("transactions", []):
+        txn = dict(txn)
         ts = txn.get("timestamp")
         if isinstance(ts, str):
-            cleaned = ts.replace("Z", "+00:00")
             try:
-                txn["timestamp"] = dt.datetime.fromisoformat(cleaned)
+                ts = dt.datetime.fromisoformat(ts.replace("Z", "+00:00"))
             except ValueError:
-                txn["timestamp"] = None
-
-    timestamps = [t.get("timestamp") for t in txns if t.get("timestamp")]
-    if timestamps:
-        start_ts = min(timestamps)
-        end_ts = max(timestamps)
-        period_days = (end_ts - start_ts).total_seconds() / 86400.0
-    else:
-        start_ts = end_ts = None
-        period_days = 0.0
-
-    total_amount = sum(t.get("amount", 0.0) for t in txns)
-    unique_counterparties = len({t.get("counterparty") for t in txns})
+                ts = None
+            txn["timestamp"] = ts
+        if ts:
+            if start_ts is None or ts < start_ts:
+                start_ts = ts
+            if end_ts is None or ts > end_ts:
+                end_ts = ts
+        total_amount += txn.get("amount", 0.0)
+        counterparties.add(txn.get("counterparty"))
+        txns.append(txn)
+
+    period_days = (end_ts - start_ts).total_seconds() / 86400.0 if start_ts is not None else 0.0
+    unique_counterparties = len(counterparties)
 
     return {
         "customer": customer,
@@ -82,18 +95,10 @@ def build_evidence_pack(decision_data, evidence_blocks):
     narrative_dataset = {
         "summary": summary,
         "customer_profile": masked_customer,
-        "evidence_blocks": copy.deepcopy(evidence_blocks),
+        # JSON round-trip is a much cheaper detached copy than deepcopy here
+        "evidence_blocks": orjson.loads(orjson.dumps(evidence_blocks)),
         "generated_at": dt.datetime.utcnow().isoformat() + "Z",
     }
 
     return narrative_dataset
 
-
-def serialize_for_json(obj):
-    if isinstance(obj, dt.datetime):
-        return obj.isoformat()
-    if isinstance(obj, list):
-        return [serialize_for_json(i) for i in obj]
-    if isinstance(obj, dict):
-        return {k: serialize_for_json(v) for k, v in obj.items()}
-    return obj
@@ -7,17 +7,22 @@ from typing import Dict, List
 def build_explainability_trace(formatted_narrative: Dict[str, object], evidence_blocks: List[dict]) -> List[dict]:
     """Link each narrative section to supporting evidence and rule metadata."""
     evidence_by_rule = {b.get("rule_id"): b for b in evidence_blocks}
-    trace: List[dict] = []
+    # Rule-derived fields are resolved once and shared (not copied) across sections.
+    rules = [
+        (rule_id, b.get("rule_name"), b.get("confidence_score", 0.0), b.get("evidence", []))
+        for rule_id, b in evidence_by_rule.items()
+    ]
+    statements = [(section, text[:240]) for section, text in formatted_narrative.get("sections", {}).items()]
 
-    for section, text in formatted_narrative.get("sections", {}).items():
-        for rule_id, evidence in evidence_by_rule.items():
-            confidence = evidence.get("confidence_score", 0.0)
-            trace.append({
-                "section": section,
-                "statement": text[:240],
-                "supporting_evidence_id": rule_id,
-                "rule_triggered": evidence.get("rule_name"),
-                "confidence_weight": confidence,
-                "evidence_details": evidence.get("evidence", []),
-            })
-    return trace
+    return [
+        {
+            "section": section,
+            "statement": statement,
+            "supporting_evidence_id": rule_id,
+            "rule_triggered": rule_name,
+            "confidence_weight": confidence,
+            "evidence_details": details,
+        }
+        for section, statement in statements
+        for rule_id, rule_name, confidence, details in rules
+    ]
@@ -0,0 +1,36 @@
+"""orjson encoding with a stdlib fallback for integers orjson cannot represent.
+
+orjson raises on integers outside the 64-bit range and silently parses them to
+floats, while the stdlib ``json`` module round-trips them exactly. Alert
+payloads are user input (account numbers may arrive as long integers), so every
+path that persists or echoes them goes through these helpers.
+"""
+import datetime as dt
+import json
+import re
+
+import orjson
+
+# 19+ digit runs may exceed orjson's int range; only then parse with the stdlib
+_LONG_DIGITS_RE = re.compile(r"\d{19,}")
+
+
+def _default(obj):
+    if isinstance(obj, (dt.datetime, dt.date, dt.time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj, option=None) -> bytes:
+    try:
+        return orjson.dumps(obj, option=option)
+    except orjson.JSONEncodeError:
+        sort_keys = bool(option and option & orjson.OPT_SORT_KEYS)
+        return json.dumps(obj, default=_default, sort_keys=sort_keys, separators=(",", ":")).encode()
+
+
+def loads(data):
+    text = data.decode() if isinstance(data, (bytes, bytearray)) else data
+    if _LONG_DIGITS_RE.search(text):
+        return json.loads(text)
+    return orjson.loads(text)
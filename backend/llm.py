@@ -1,14 +1,37 @@
-import json
+import functools
 from pathlib import Path
-import requests
+import httpx
+import orjson
 
+from . import jsonutil
 from .config import OLLAMA_MODEL, OLLAMA_URL, USE_MOCK_LLM
 
 PROMPT_PATH = Path(__file__).resolve().parent / "prompts" / "sar_prompt.txt"
 
+# Shared keep-alive pool so each generation reuses an open Ollama connection.
+# Created on first use and dropped by close_client(), so an app restarted in
+# the same process (shutdown, then startup again) gets a fresh client.
+_client = None
 
-def _load_prompt_template():
-    return PROMPT_PATH.read_text(encoding="utf-8")
+
+def _get_client():
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(timeout=300, limits=httpx.Limits(max_keepalive_connections=4))
+    return _client
+
+
+@functools.lru_cache(maxsize=1)
+def _prompt_fragments():
+    """Read the template once and split it around its two placeholders.
+
+    The template embeds a literal JSON schema, so it is assembled by joining
+    fragments rather than with ``str.format``.
+    """
+    template = PROMPT_PATH.read_text(encoding="utf-8")
+    pre, rest = template.split("{narrative_dataset}", 1)
+    mid, post = rest.split("{rag_context}", 1)
+    return pre, mid, post
 
 
 def _extract_json(text):
@@ -19,16 +42,65 @@ def _extract_json(text):
         raise ValueError(f"No JSON object found in LLM response: {text[:200]}")
     json_str = text[start:end + 1]
     try:
-        return json.loads(json_str)
-    except json.JSONDecodeError as e:
+        return orjson.loads(json_str)
+    except orjson.JSONDecodeError as e:
         raise ValueError(f"Invalid JSON in LLM response: {e}. Text: {json_str[:200]}")
 
 
-def _generate_mock_narrative(narrative_dataset):
+class _JsonObjectScanner:
+    """Tracks brace depth over streamed text until the first top-level object closes."""
+
+    def __init__(self):
+        self.parts = []
+        self.pos = 0
+        self.start = -1
+        self.end = -1
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+
+    def feed(self, fragment):
+        self.parts.append(fragment)
+        for i, ch in enumerate(fragment, self.pos):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == "\\":
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = self.depth > 0
+            elif ch == "{":
+                if self.depth == 0:
+                    self.start = i
+                self.depth += 1
+            elif ch == "}" and self.depth:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.end = i + 1
+                    break
+        self.pos += len(fragment)
+        return self.complete
+
+    @property
+    def complete(self):
+        return self.end != -1
+
+    @property
+    def text(self):
+        return "".join(self.parts)
+
+    def object_text(self):
+        return self.text[self.start:self.end]
+
+
+def _generate_mock_narrative(narrative_dataset, rule_ids=None):
     """Deterministic mock narrative in sectioned format for offline dev."""
     summary = narrative_dataset.get("summary", {})
     evidence_blocks = narrative_dataset.get("evidence_blocks", [])
-    rule_ids = [b.get("rule_id") for b in evidence_blocks]
+    if rule_ids is None:
+        rule_ids = [b.get("rule_id") for b in evidence_blocks]
 
     subject = narrative_dataset.get("customer_profile", {})
     subject_text = f"Customer exhibits activity inconsistent with declared profile during {summary.get('period_start', 'N/A')} to {summary.get('period_end', 'N/A')}"
@@ -48,47 +120,67 @@ def _generate_mock_narrative(narrative_dataset):
     }
 
 
-def generate_narrative(narrative_dataset, rag_context, force_mock=False):
+async def close_client():
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        await client.aclose()
+
+
+async def generate_narrative(narrative_dataset, rag_context, force_mock=False, rule_ids=None):
     if USE_MOCK_LLM or force_mock:
-        mock_narrative = _generate_mock_narrative(narrative_dataset)
+        mock_narrative = _generate_mock_narrative(narrative_dataset, rule_ids)
         return mock_narrative, {
             "prompt": "[MOCK MODE]",
-            "raw_response": json.dumps(mock_narrative),
+            "raw_response": jsonutil.dumps(mock_narrative).decode(),
             "model": "mock",
         }
 
-    template = _load_prompt_template()
-    prompt = template.format(
-        narrative_dataset=json.dumps(narrative_dataset, ensure_ascii=False),
-        rag_context=json.dumps(rag_context, ensure_ascii=False),
-    )
+    pre, mid, post = _prompt_fragments()
+    prompt = "".join((
+        pre,
+        jsonutil.dumps(narrative_dataset).decode(),
+        mid,
+        jsonutil.dumps(rag_context).decode(),
+        post,
+    ))
 
     payload = {
         "model": OLLAMA_MODEL,
         "prompt": prompt,
-        "stream": False,
+        "stream": True,
         "options": {"temperature": 0.25, "num_predict": 1400},
         "format": "json"
     }
 
     try:
-        resp = requests.post(OLLAMA_URL, json=payload, timeout=300)
-        resp.raise_for_status()
-        data = resp.json()
-        response_payload = data.get("response", "")
-
-        if isinstance(response_payload, dict):
-            narrative = response_payload
+        # Stream tokens and stop reading as soon as the JSON object closes,
+        # instead of waiting for Ollama to finish the whole response.
+        scanner = _JsonObjectScanner()
+        async with _get_client().stream("POST", OLLAMA_URL, json=payload) as resp:
+            resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                if chunk.get("error"):
+                    raise ValueError(f"Ollama error: {chunk['error']}")
+                if scanner.feed(chunk.get("response", "")) or chunk.get("done"):
+                    break
+
+        response_payload = scanner.text
+        if scanner.complete:
+            narrative = orjson.loads(scanner.object_text())
         else:
-            narrative = _extract_json(str(response_payload))
+            narrative = _extract_json(response_payload)
 
         return narrative, {
             "prompt": prompt,
             "raw_response": response_payload,
             "model": OLLAMA_MODEL,
         }
-    except (requests.RequestException, ValueError) as e:
-        mock_narrative = _generate_mock_narrative(narrative_dataset)
+    except (httpx.HTTPError, ValueError) as e:
+        mock_narrative = _generate_mock_narrative(narrative_dataset, rule_ids)
         return mock_narrative, {
             "prompt": prompt,
             "raw_response": f"[LLM ERROR: {str(e)}] Fallback to mock",
@@ -1,26 +1,41 @@
+import asyncio
+import functools
 import uuid
-from typing import List
+from dataclasses import dataclass
+from typing import List, Tuple
 
+import orjson
 from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import select
+from sqlalchemy.orm import load_only
 
-from .audit import get_audit_timeline, log_event
-from .config import TOP_K
+from . import jsonutil
+from .audit import audit_row, get_audit_timeline, log_event, log_events_bulk, queue_event
+from .config import BATCH_CONCURRENCY, TOP_K
 from .db import SessionLocal, init_db
-from .evidence import build_decision_dataset, build_evidence_pack, serialize_for_json
+from .evidence import build_decision_dataset, build_evidence_pack
 from .explainability import build_explainability_trace
-from .llm import generate_narrative
+from .llm import close_client, generate_narrative
 from .metrics import metrics, timed
 from .models import Case
 from .pdf_exporter import generate_pdf
-from .rag import RAGRetriever
+from .rag import get_retriever
 from .review_workflow import can_transition, record_history
-from .risk_engine import assess_risk
+from .risk_engine import RiskAssessment, assess_risk
 from .rules import evaluate_rules
 from .sar_formatter import format_sar_narrative, narrative_as_text
 from .validation_v2 import validate_v2
 
-app = FastAPI(title="SAR Narrative Generator")
+
+class SafeORJSONResponse(ORJSONResponse):
+    def render(self, content) -> bytes:
+        # Stored alerts may hold integers beyond orjson's 64-bit range
+        return jsonutil.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+app = FastAPI(title="SAR Narrative Generator", default_response_class=SafeORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -29,86 +44,116 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-rag_retriever = RAGRetriever()
-
-
 @app.on_event("startup")
 def startup():
     init_db()
-    rag_retriever.load_corpus()
+    get_retriever().load_corpus()
+
 
+@app.on_event("shutdown")
+async def shutdown():
+    await close_client()
 
-def _confidence_from_evidence(evidence_blocks: List[dict]) -> float:
-    if not evidence_blocks:
-        return 0.5
-    return sum(b.get("confidence_score", 0.0) for b in evidence_blocks) / len(evidence_blocks)
 
+def _summarize_evidence(evidence_blocks: List[dict]) -> Tuple[List[str], float]:
+    """Collect rule ids and the mean confidence in one pass over the blocks."""
+    rule_ids = []
+    total = 0.0
+    for b in evidence_blocks:
+        rule_ids.append(b.get("rule_id"))
+        total += b.get("confidence_score", 0.0)
+    confidence_level = total / len(rule_ids) if rule_ids else 0.5
+    return rule_ids, confidence_level
 
-def _hallucination_guard(formatted_narrative, evidence_blocks):
+
+def _hallucination_guard(formatted_narrative, rule_ids: List[str]):
     citations = set(formatted_narrative.get("evidence_citations", []))
-    rule_ids = {b.get("rule_id") for b in evidence_blocks}
     if not citations or not citations.issubset(rule_ids):
         metrics.record_hallucination_rejection()
         raise HTTPException(status_code=400, detail="Narrative rejected: unsupported claims detected")
 
 
-@timed
-def run_pipeline(session, case_obj, alert):
-    metrics.record_request()
+@functools.lru_cache(maxsize=512)
+def _cached_retrieve(summary_signature: str, top_k: int) -> List[dict]:
+    """Vector search keyed by the canonical summary JSON; repeats skip Chroma.
+
+    The returned list is shared between cases and must not be mutated.
+    """
+    return get_retriever().retrieve(query=summary_signature, top_k=top_k)
+
+
+@dataclass
+class PreparedCase:
+    decision_data: dict
+    evidence_blocks: List[dict]
+    rule_ids: List[str]
+    confidence_level: float
+    risk_assessment: RiskAssessment
+    narrative_dataset: dict
+    rag_context: List[dict]
+
+
+def _prepare_case(case_obj, alert) -> PreparedCase:
+    """Enrichment, rules, risk, evidence and retrieval ahead of the LLM call."""
     decision_data = build_decision_dataset(alert)
-    decision_data_json = serialize_for_json(decision_data)
-    log_event(session, case_obj.id, "ENRICHED", {"decision_data": decision_data_json})
+    # The round-trip encodes datetimes and yields a JSON-safe copy
+    decision_data_json = jsonutil.loads(jsonutil.dumps(decision_data))
+    queue_event(case_obj, "ENRICHED", {"decision_data": decision_data_json})
 
     evidence_blocks, risk_score = evaluate_rules(decision_data)
-    log_event(session, case_obj.id, "RULE_TRIGGERED", {"evidence_blocks": evidence_blocks})
+    rule_ids, confidence_level = _summarize_evidence(evidence_blocks)
+    queue_event(case_obj, "RULE_TRIGGERED", {"evidence_blocks": evidence_blocks})
 
     risk_assessment = assess_risk(decision_data, evidence_blocks)
-    log_event(session, case_obj.id, "RISK_ASSESSED", risk_assessment.__dict__)
+    queue_event(case_obj, "RISK_ASSESSED", risk_assessment.__dict__)
 
     narrative_dataset = build_evidence_pack(decision_data, evidence_blocks)
-    log_event(session, case_obj.id, "EVIDENCE_BUILT", {"narrative_dataset": narrative_dataset})
+    queue_event(case_obj, "EVIDENCE_BUILT", {"narrative_dataset": narrative_dataset})
 
-    rag_context = rag_retriever.retrieve(
-        query=str(narrative_dataset.get("summary")),
-        top_k=TOP_K,
+    rag_context = _cached_retrieve(
+        jsonutil.dumps(narrative_dataset.get("summary"), option=orjson.OPT_SORT_KEYS).decode(),
+        TOP_K,
+    )
+    queue_event(case_obj, "RETRIEVAL_COMPLETE", {"rag_context": rag_context})
+
+    return PreparedCase(
+        decision_data_json, evidence_blocks, rule_ids, confidence_level,
+        risk_assessment, narrative_dataset, rag_context,
     )
-    log_event(session, case_obj.id, "RETRIEVAL_COMPLETE", {"rag_context": rag_context})
 
-    try:
-        narrative, llm_meta = generate_narrative(narrative_dataset, rag_context)
-    except Exception as e:
-        log_event(session, case_obj.id, "ERROR", {"error": f"LLM failure: {str(e)}"})
-        narrative, llm_meta = generate_narrative(narrative_dataset, rag_context, force_mock=True)
 
-    log_event(session, case_obj.id, "DRAFT_GENERATED", {
+def _finalize_case(session, case_obj, prepared: PreparedCase, narrative, llm_meta):
+    """Format, trace and validate the draft, then persist the case in one commit."""
+    evidence_blocks = prepared.evidence_blocks
+    risk_assessment = prepared.risk_assessment
+    queue_event(case_obj, "DRAFT_GENERATED", {
         "llm_meta": llm_meta,
         "narrative": narrative,
     })
 
-    evidence_citations = [b.get("rule_id") for b in evidence_blocks]
-    confidence_level = _confidence_from_evidence(evidence_blocks)
+    confidence_level = prepared.confidence_level
     formatted = format_sar_narrative(
         llm_sections=narrative,
         risk_score=risk_assessment.risk_score,
         risk_level=risk_assessment.risk_level,
         confidence_level=confidence_level,
-        evidence_citations=evidence_citations,
+        evidence_citations=prepared.rule_ids,
         contributing_factors=risk_assessment.contributing_factors,
     )
 
     explainability_trace = build_explainability_trace(formatted, evidence_blocks)
     validation = validate_v2(formatted, explainability_trace)
     metrics.record_validation(validation.get("passed"))
-    log_event(session, case_obj.id, "VALIDATED", {"validation": validation})
+    queue_event(case_obj, "VALIDATED", {"validation": validation})
 
-    _hallucination_guard(formatted, evidence_blocks)
+    _hallucination_guard(formatted, prepared.rule_ids)
 
     sar_text = narrative_as_text(formatted)
     validation_status = "DRAFT" if validation.get("passed") else "VALIDATION_FAILED"
 
-    case_obj.decision_data = decision_data_json
-    case_obj.evidence_data = narrative_dataset
-    case_obj.rag_context = rag_context
+    case_obj.decision_data = prepared.decision_data
+    case_obj.evidence_data = prepared.narrative_dataset
+    case_obj.rag_context = prepared.rag_context
     case_obj.draft_narrative = formatted
     case_obj.validation_results = validation
     case_obj.validation_v2_results = validation
@@ -121,8 +166,28 @@ def run_pipeline(session, case_obj, alert):
     session.commit()
 
 
+@timed
+async def run_pipeline(session, case_obj, alert):
+    metrics.record_request()
+    # CPU and DB work runs in worker threads; the LLM round-trip is awaited
+    # on the event loop so other requests are served meanwhile.
+    prepared = await asyncio.to_thread(_prepare_case, case_obj, alert)
+
+    try:
+        narrative, llm_meta = await generate_narrative(
+            prepared.narrative_dataset, prepared.rag_context, rule_ids=prepared.rule_ids,
+        )
+    except Exception as e:
+        queue_event(case_obj, "ERROR", {"error": f"LLM failure: {str(e)}"})
+        narrative, llm_meta = await generate_narrative(
+            prepared.narrative_dataset, prepared.rag_context, force_mock=True, rule_ids=prepared.rule_ids,
+        )
+
+    await asyncio.to_thread(_finalize_case, session, case_obj, prepared, narrative, llm_meta)
+
+
 @app.post("/ingest-alert")
-def ingest_alert(alert: dict):
+async def ingest_alert(alert: dict):
     session = SessionLocal()
     case_id = str(uuid.uuid4())
 
@@ -132,14 +197,12 @@ def ingest_alert(alert: dict):
         status="INGESTED",
     )
     session.add(case_obj)
-    session.commit()
-
-    log_event(session, case_id, "INGESTED", {"alert": alert})
+    queue_event(case_obj, "INGESTED", {"alert": alert})
 
     try:
-        run_pipeline(session, case_obj, alert)
+        await run_pipeline(session, case_obj, alert)
     except Exception as exc:
-        log_event(session, case_id, "ERROR", {"error": str(exc)})
+        await asyncio.to_thread(log_event, session, case_id, "ERROR", {"error": str(exc)})
         raise HTTPException(status_code=500, detail=str(exc))
     finally:
         # Snapshot status before closing to avoid DetachedInstanceError
@@ -149,26 +212,55 @@ def ingest_alert(alert: dict):
     return {"case_id": case_id, "status": status}
 
 
-@app.post("/batch-ingest")
-def batch_ingest(payload: dict):
-    alerts = payload.get("alerts", [])
+def _insert_batch_cases(case_ids, alerts):
+    """Create every batch case row and its INGESTED event in a single commit."""
     session = SessionLocal()
-    metrics.record_batch()
-    results = []
-    for alert in alerts:
-        case_id = str(uuid.uuid4())
-        case_obj = Case(id=case_id, alert_json=alert, status="INGESTED")
-        session.add(case_obj)
-        session.commit()
-        log_event(session, case_id, "INGESTED", {"alert": alert})
+    session.bulk_insert_mappings(Case, [
+        {"id": case_id, "alert_json": alert, "status": "INGESTED"}
+        for case_id, alert in zip(case_ids, alerts)
+    ])
+    log_events_bulk(session, [
+        audit_row(case_id, "INGESTED", {"alert": alert})
+        for case_id, alert in zip(case_ids, alerts)
+    ])
+    session.close()
+
+
+async def _batch_ingest_one(case_id, alert, semaphore, error_rows):
+    # Sessions are not safe to share across concurrent pipelines; each alert gets its own.
+    async with semaphore:
+        session = SessionLocal()
+        case_obj = await asyncio.to_thread(session.get, Case, case_id)
         try:
-            run_pipeline(session, case_obj, alert)
+            await run_pipeline(session, case_obj, alert)
             status = case_obj.status
         except Exception as exc:
-            log_event(session, case_id, "ERROR", {"error": str(exc)})
+            error_rows.append(audit_row(case_id, "ERROR", {"error": str(exc)}))
+            # persist the audit events queued before the failure
+            await asyncio.to_thread(session.commit)
             status = "ERROR"
-        results.append({"case_id": case_id, "status": status, "risk_score": case_obj.risk_score})
-    session.close()
+        finally:
+            session.close()
+        return {"case_id": case_id, "status": status, "risk_score": case_obj.risk_score or 0.0}
+
+
+@app.post("/batch-ingest")
+async def batch_ingest(payload: dict):
+    alerts = payload.get("alerts", [])
+    metrics.record_batch()
+    case_ids = [str(uuid.uuid4()) for _ in alerts]
+    await asyncio.to_thread(_insert_batch_cases, case_ids, alerts)
+
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+    error_rows = []
+    results = await asyncio.gather(*(
+        _batch_ingest_one(case_id, alert, semaphore, error_rows)
+        for case_id, alert in zip(case_ids, alerts)
+    ))
+    if error_rows:
+        session = SessionLocal()
+        await asyncio.to_thread(log_events_bulk, session, error_rows)
+        session.close()
     # priority queue by risk descending
     results = sorted(results, key=lambda r: r.get("risk_score", 0), reverse=True)
     return {"results": results}
@@ -177,16 +269,20 @@ def batch_ingest(payload: dict):
 @app.get("/cases")
 def list_cases():
     session = SessionLocal()
-    cases = session.query(Case).order_by(Case.created_at.desc()).all()
+    # Column-only select: skips ORM hydration and never reads the JSON columns
+    rows = session.execute(
+        select(Case.id, Case.status, Case.created_at, Case.risk_score, Case.risk_level)
+        .order_by(Case.created_at.desc())
+    ).all()
     result = [
         {
-            "id": c.id,
-            "status": c.status,
-            "created_at": c.created_at.isoformat() + "Z",
-            "risk_score": c.risk_score,
-            "risk_level": c.risk_level,
+            "id": case_id,
+            "status": status,
+            "created_at": created_at.isoformat() + "Z",
+            "risk_score": risk_score,
+            "risk_level": risk_level,
         }
-        for c in cases
+        for case_id, status, created_at, risk_score, risk_level in rows
     ]
     session.close()
     return result
@@ -195,7 +291,7 @@ def list_cases():
 @app.get("/cases/{case_id}")
 def get_case(case_id: str):
     session = SessionLocal()
-    case_obj = session.query(Case).filter(Case.id == case_id).first()
+    case_obj = session.get(Case, case_id)
     if not case_obj:
         session.close()
         raise HTTPException(status_code=404, detail="Case not found")
@@ -229,7 +325,7 @@ def get_case(case_id: str):
 def submit_case(case_id: str, payload: dict = None):
     session = SessionLocal()
     payload = payload or {}
-    case_obj = session.query(Case).filter(Case.id == case_id).first()
+    case_obj = session.get(Case, case_id)
     if not case_obj:
         session.close()
         raise HTTPException(status_code=404, detail="Case not found")
@@ -250,7 +346,7 @@ def submit_case(case_id: str, payload: dict = None):
 @app.post("/cases/{case_id}/approve")
 def approve_case(case_id: str, payload: dict):
     session = SessionLocal()
-    case_obj = session.query(Case).filter(Case.id == case_id).first()
+    case_obj = session.get(Case, case_id)
     if not case_obj:
         session.close()
         raise HTTPException(status_code=404, detail="Case not found")
@@ -276,7 +372,7 @@ def approve_case(case_id: str, payload: dict):
 @app.post("/cases/{case_id}/reject")
 def reject_case(case_id: str, payload: dict):
     session = SessionLocal()
-    case_obj = session.query(Case).filter(Case.id == case_id).first()
+    case_obj = session.get(Case, case_id)
     if not case_obj:
         session.close()
         raise HTTPException(status_code=404, detail="Case not found")
@@ -301,7 +397,7 @@ def reject_case(case_id: str, payload: dict):
 def finalize_case(case_id: str, payload: dict = None):
     session = SessionLocal()
     payload = payload or {}
-    case_obj = session.query(Case).filter(Case.id == case_id).first()
+    case_obj = session.get(Case, case_id)
     if not case_obj:
         session.close()
         raise HTTPException(status_code=404, detail="Case not found")
@@ -321,7 +417,7 @@ def finalize_case(case_id: str, payload: dict = None):
 @app.get("/cases/{case_id}/audit")
 def case_audit(case_id: str):
     session = SessionLocal()
-    case_obj = session.query(Case).filter(Case.id == case_id).first()
+    case_obj = session.get(Case, case_id, options=[load_only(Case.id)])
     if not case_obj:
         session.close()
         raise HTTPException(status_code=404, detail="Case not found")
@@ -333,7 +429,7 @@ def case_audit(case_id: str):
 @app.get("/cases/{case_id}/export/pdf")
 def export_pdf(case_id: str):
     session = SessionLocal()
-    case_obj = session.query(Case).filter(Case.id == case_id).first()
+    case_obj = session.get(Case, case_id, options=[load_only(Case.final_narrative, Case.draft_narrative)])
     if not case_obj:
         session.close()
         raise HTTPException(status_code=404, detail="Case not found")
@@ -345,7 +441,10 @@ def export_pdf(case_id: str):
 @app.get("/cases/{case_id}/export/json")
 def export_json(case_id: str):
     session = SessionLocal()
-    case_obj = session.query(Case).filter(Case.id == case_id).first()
+    case_obj = session.get(Case, case_id, options=[load_only(
+        Case.final_narrative, Case.draft_narrative, Case.risk_score, Case.risk_level,
+        Case.confidence_level, Case.explainability_trace,
+    )])
     if not case_obj:
         session.close()
         raise HTTPException(status_code=404, detail="Case not found")
@@ -362,7 +461,7 @@ def export_json(case_id: str):
 @app.get("/cases/{case_id}/export/audit")
 def export_audit_bundle(case_id: str):
     session = SessionLocal()
-    case_obj = session.query(Case).filter(Case.id == case_id).first()
+    case_obj = session.get(Case, case_id, options=[load_only(Case.final_narrative, Case.draft_narrative)])
     if not case_obj:
         session.close()
         raise HTTPException(status_code=404, detail="Case not found")
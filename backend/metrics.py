@@ -1,9 +1,15 @@
 """Performance metrics collector."""
 from __future__ import annotations
 
+import inspect
+import threading
 import time
+from collections import deque
 from typing import Dict
 
+# Number of most recent pipeline latencies kept for the rolling average
+LATENCY_WINDOW = 1024
+
 
 class Metrics:
     def __init__(self):
@@ -15,8 +21,11 @@ class Metrics:
             "batch_requests": 0,
         }
         self.durations = {
-            "generation_latency_ms": [],
+            "generation_latency_ms": deque(maxlen=LATENCY_WINDOW),
         }
+        self._latency_sum = 0.0
+        # Pipelines finish in worker threads; keep window and sum consistent
+        self._latency_lock = threading.Lock()
 
     def record_request(self):
         self.counters["requests_total"] += 1
@@ -32,13 +41,19 @@ class Metrics:
         self.counters["batch_requests"] += 1
 
     def record_latency(self, ms: float):
-        self.durations["generation_latency_ms"].append(ms)
+        window = self.durations["generation_latency_ms"]
+        with self._latency_lock:
+            if len(window) == window.maxlen:
+                self._latency_sum -= window[0]
+            window.append(ms)
+            self._latency_sum += ms
 
     def snapshot(self) -> Dict[str, object]:
         avg_latency = 0.0
-        latencies = self.durations.get("generation_latency_ms", [])
-        if latencies:
-            avg_latency = sum(latencies) / len(latencies)
+        latencies = self.durations["generation_latency_ms"]
+        with self._latency_lock:
+            if latencies:
+                avg_latency = self._latency_sum / len(latencies)
         return {
             "counters": self.counters,
             "average_latency_ms": round(avg_latency, 2),
@@ -49,11 +64,19 @@ metrics = Metrics()
 
 
 def timed(fn):
+    if inspect.iscoroutinefunction(fn):
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            result = await fn(*args, **kwargs)
+            metrics.record_latency((time.perf_counter_ns() - start) / 1e6)
+            return result
+
+        return async_wrapper
+
     def wrapper(*args, **kwargs):
-        start = time.time()
+        start = time.perf_counter_ns()
         result = fn(*args, **kwargs)
-        end = time.time()
-        metrics.record_latency((end - start) * 1000)
+        metrics.record_latency((time.perf_counter_ns() - start) / 1e6)
         return result
 
     return wrapper
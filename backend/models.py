@@ -1,5 +1,5 @@
 import datetime as dt
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, Text
 from sqlalchemy.types import JSON
 
 from .db import Base
@@ -9,7 +9,7 @@ class Case(Base):
     __tablename__ = "cases"
 
     id = Column(String, primary_key=True, index=True)
-    created_at = Column(DateTime, default=dt.datetime.utcnow)
+    created_at = Column(DateTime, default=dt.datetime.utcnow, index=True)
     status = Column(String, default="INGESTED")
     analyst_role = Column(String, default="analyst")
 
@@ -34,9 +34,11 @@ class Case(Base):
 
 class AuditEvent(Base):
     __tablename__ = "audit_events"
+    # Serves the per-case timeline (filter on case_id, order by timestamp)
+    __table_args__ = (Index("ix_audit_case_ts", "case_id", "timestamp"),)
 
     id = Column(Integer, primary_key=True, index=True)
-    case_id = Column(String, index=True)
+    case_id = Column(String)
     timestamp = Column(DateTime, default=dt.datetime.utcnow)
     event_type = Column(String, index=True)
     payload = Column(JSON)
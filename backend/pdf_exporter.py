@@ -4,10 +4,15 @@ Unicode safe, multi-page, professional compliance layout
 """
 
 from __future__ import annotations
-from typing import Dict, List
+import copy
+from functools import lru_cache
+from typing import Dict, List, Tuple
 import datetime as dt
 from pathlib import Path
-from fpdf import FPDF
+from fontTools import ttLib
+from fpdf import FPDF, FPDF_VERSION
+from fpdf.enums import TextEmphasis, XPos, YPos
+from fpdf.fonts import SubsetMap, TTFFont
 
 
 # =========================================================
@@ -48,6 +53,60 @@ def _safe_text(value: object) -> str:
         return ""
 
 
+# =========================================================
+# FONT CACHE
+# =========================================================
+
+FONT_DIR = Path(__file__).resolve().parent / "fonts"
+
+# _CachedTTFFont mirrors TTFFont.__init__ and its slot layout from this exact
+# fpdf2 release; any other version registers fonts with the stock add_font.
+_FONT_CACHE_FPDF_VERSION = "2.7.9"
+_FONT_CACHE_SUPPORTED = FPDF_VERSION == _FONT_CACHE_FPDF_VERSION
+
+# Metrics parsed from the TTF that output() only reads; identical for every
+# document. ``cw`` is a defaultdict, so looking up a glyph the font lacks inserts
+# the font's default width: documents sharing it only ever add that same
+# constant, and the dict grows by at most one entry per distinct missing code
+# point. ``desc`` is not shared: output() stamps its name, object id and font
+# stream onto it.
+_SHARED_FONT_ATTRS = ("scale", "cw", "cmap", "glyph_ids", "name", "up", "ut")
+
+
+@lru_cache(maxsize=None)
+def _parsed_font(font_file_path: Path) -> TTFFont:
+    """Parse a TTF once per process (the cmap/width walk dominates add_font)."""
+    template = TTFFont(FPDF(), font_file_path, "template", "")
+    template.close()
+    return template
+
+
+class _CachedTTFFont(TTFFont):
+    """TTFFont that reuses cached metrics and only keeps per-document state."""
+
+    __slots__ = ()
+
+    def __init__(self, fpdf, font_file_path, fontkey, style):
+        template = _parsed_font(font_file_path)
+        self.i = len(fpdf.fonts) + 1
+        self.type = "TTF"
+        self.ttffile = font_file_path
+        self.fontkey = fontkey
+        # Fresh lazy handle per document: output() subsets it in place
+        self.ttfont = ttLib.TTFont(font_file_path, recalcTimestamp=False, fontNumber=0, lazy=True)
+        for attr in _SHARED_FONT_ATTRS:
+            setattr(self, attr, getattr(template, attr))
+        self.desc = copy.copy(template.desc)
+        self.missing_glyphs = []
+        self.emphasis = TextEmphasis.coerce(style)
+
+        sbarr = "\x00 \r\n"
+        if fpdf.str_alias_nb_pages:
+            sbarr += "0123456789"
+            sbarr += fpdf.str_alias_nb_pages
+        self.subset = SubsetMap(self, [ord(char) for char in sbarr])
+
+
 # =========================================================
 # PDF CLASS WITH HEADER / FOOTER
 # =========================================================
@@ -66,12 +125,19 @@ class SarPDF(FPDF):
         self.set_right_margin(16)
 
         # Unicode fonts (REQUIRED)
-        self.add_font("DejaVu", "", str(font_dir / "DejaVuSans.ttf"), uni=True)
-        self.add_font("DejaVu", "B", str(font_dir / "DejaVuSans-Bold.ttf"), uni=True)
-        self.add_font("DejaVu", "I", str(font_dir / "DejaVuSans-Oblique.ttf"), uni=True)
+        self._add_cached_font("DejaVu", "", font_dir / "DejaVuSans.ttf")
+        self._add_cached_font("DejaVu", "B", font_dir / "DejaVuSans-Bold.ttf")
+        self._add_cached_font("DejaVu", "I", font_dir / "DejaVuSans-Oblique.ttf")
 
         self.alias_nb_pages()
 
+    def _add_cached_font(self, family: str, style: str, font_path: Path):
+        if not _FONT_CACHE_SUPPORTED:
+            self.add_font(family, style, str(font_path))
+            return
+        fontkey = f"{family.lower()}{style}"
+        self.fonts[fontkey] = _CachedTTFFont(self, font_path, fontkey, style)
+
     # -----------------------------------------------------
 
     def header(self):
@@ -112,25 +178,31 @@ def section_divider(pdf: FPDF):
     pdf.ln(6)
 
 
+def paragraph(pdf: FPDF, h: float, text: str):
+    # multi_cell leaves x at the right edge by default; return to the margin
+    pdf.multi_cell(0, h, text, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+
+def _risk_figures(narrative: Dict[str, object]) -> Tuple[str, str, str]:
+    return (
+        _safe_text(narrative.get("risk_level") or "N/A").upper(),
+        f"{narrative.get('risk_score') or 0:.2f}",
+        f"{narrative.get('confidence_level') or 0:.2f}",
+    )
+
+
 # =========================================================
 # EXECUTIVE SUMMARY
 # =========================================================
 
-def render_case_summary(pdf: FPDF, narrative: Dict[str, object]):
+def render_case_summary(pdf: FPDF, narrative: Dict[str, object], figures: Tuple[str, str, str]):
     pdf.set_font("DejaVu", "B", 13)
     pdf.cell(0, 8, "EXECUTIVE CASE SUMMARY", ln=1)
 
     pdf.set_font("DejaVu", "", 11)
 
-    risk_level = _safe_text(narrative.get("risk_level") or "N/A").upper()
-    risk_score = narrative.get("risk_score") or 0
-    confidence = narrative.get("confidence_level") or 0
-
-    pdf.multi_cell(
-        0,
-        6,
-        f"Risk Level: {risk_level} | Risk Score: {round(risk_score,2)} | Confidence: {round(confidence,2)}"
-    )
+    risk_level, risk_score, confidence = figures
+    paragraph(pdf, 6, f"Risk Level: {risk_level} | Risk Score: {risk_score} | Confidence: {confidence}")
 
     contrib = narrative.get("contributing_factors") or {}
     if contrib:
@@ -138,8 +210,7 @@ def render_case_summary(pdf: FPDF, narrative: Dict[str, object]):
         pdf.set_font("DejaVu", "B", 11)
         pdf.cell(0, 6, "Key Contributing Factors", ln=1)
         pdf.set_font("DejaVu", "", 10)
-        for k, v in contrib.items():
-            pdf.multi_cell(0, 5.5, f"- {k}: {_safe_text(v)}")
+        paragraph(pdf, 5.5, "\n".join(f"- {k}: {_safe_text(v)}" for k, v in contrib.items()))
 
     pdf.ln(4)
 
@@ -148,21 +219,17 @@ def render_case_summary(pdf: FPDF, narrative: Dict[str, object]):
 # RISK OVERVIEW
 # =========================================================
 
-def render_risk_overview(pdf: FPDF, narrative: Dict[str, object]):
+def render_risk_overview(pdf: FPDF, figures: Tuple[str, str, str]):
     pdf.set_font("DejaVu", "B", 12)
     pdf.cell(0, 7, "RISK OVERVIEW", ln=1)
 
     pdf.set_font("DejaVu", "", 11)
-    pdf.multi_cell(
-        0,
-        5.5,
-        f"Overall risk posture is assessed as {_safe_text(narrative.get('risk_level')).upper()} "
-        f"with computed score {round(narrative.get('risk_score') or 0,2)}."
-    )
-    pdf.multi_cell(
-        0,
+    risk_level, risk_score, confidence = figures
+    paragraph(
+        pdf,
         5.5,
-        f"Model confidence level is {round(narrative.get('confidence_level') or 0,2)}."
+        f"Overall risk posture is assessed as {risk_level} with computed score {risk_score}.\n"
+        f"Model confidence level is {confidence}."
     )
     pdf.ln(4)
 
@@ -179,10 +246,9 @@ def render_evidence_summary(pdf: FPDF, narrative: Dict[str, object]):
     citations = narrative.get("evidence_citations") or []
 
     if not citations:
-        pdf.multi_cell(0, 5.5, "No supporting evidence citations provided.")
+        paragraph(pdf, 5.5, "No supporting evidence citations provided.")
     else:
-        for i, cite in enumerate(citations, 1):
-            pdf.multi_cell(0, 5.5, f"{i}. {_safe_text(cite)}")
+        paragraph(pdf, 5.5, "\n".join(f"{i}. {_safe_text(cite)}" for i, cite in enumerate(citations, 1)))
 
     pdf.ln(4)
 
@@ -207,7 +273,7 @@ def render_narrative_sections(pdf: FPDF, narrative: Dict[str, object]):
         pdf.cell(0, 7, section.upper(), ln=1)
 
         pdf.set_font("DejaVu", "", 11)
-        pdf.multi_cell(0, 5.5, text)
+        paragraph(pdf, 5.5, text)
         pdf.ln(3)
 
 
@@ -220,7 +286,7 @@ def render_compliance_declaration(pdf: FPDF):
     pdf.cell(0, 7, "COMPLIANCE DECLARATION", ln=1)
 
     pdf.set_font("DejaVu", "", 11)
-    pdf.multi_cell(0, 5.5, COMPLIANCE_DECLARATION)
+    paragraph(pdf, 5.5, COMPLIANCE_DECLARATION)
     pdf.ln(3)
 
 
@@ -231,15 +297,15 @@ def render_compliance_declaration(pdf: FPDF):
 def generate_pdf(narrative: Dict[str, object]) -> bytes:
     timestamp = dt.datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S UTC")
     case_id = _safe_text(narrative.get("case_id"))
-    font_dir = Path(__file__).resolve().parent / "fonts"
+    figures = _risk_figures(narrative)
 
-    pdf = SarPDF(case_id, ORG_PLACEHOLDER, timestamp, font_dir)
+    pdf = SarPDF(case_id, ORG_PLACEHOLDER, timestamp, FONT_DIR)
 
     # PAGE 1
     pdf.add_page()
-    render_case_summary(pdf, narrative)
+    render_case_summary(pdf, narrative, figures)
     section_divider(pdf)
-    render_risk_overview(pdf, narrative)
+    render_risk_overview(pdf, figures)
     section_divider(pdf)
     render_evidence_summary(pdf, narrative)
 
@@ -248,8 +314,8 @@ def generate_pdf(narrative: Dict[str, object]) -> bytes:
     render_narrative_sections(pdf, narrative)
     render_compliance_declaration(pdf)
 
-    raw_pdf = pdf.output(dest="S")
-    pdf_bytes = raw_pdf.encode("latin-1") if isinstance(raw_pdf, str) else bytes(raw_pdf)
+    # fpdf2 renders into an in-memory bytearray
+    pdf_bytes = bytes(pdf.output())
 
     if not pdf_bytes:
         raise ValueError("Empty PDF output")
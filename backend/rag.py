@@ -1,36 +1,137 @@
 import os
+import threading
 from pathlib import Path
 import chromadb
-from chromadb.utils import embedding_functions
+import numpy as np
+from sentence_transformers import SentenceTransformer
 
-from .config import CHROMA_DIR, CORPUS_DIR
+from .config import (
+    CHROMA_DIR,
+    CHROMA_HOST,
+    CHROMA_PORT,
+    CORPUS_DIR,
+    EMBEDDING_DEVICE,
+    RAG_CACHE_SIZE,
+    RAG_CACHE_THRESHOLD,
+)
+
+UPSERT_BATCH_SIZE = 1000
+
+# Unit vectors are stored in the semantic cache as int8 scaled by this factor
+_QUANT_SCALE = 127
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+class SemanticCache:
+    """LRU cache of retrieval results keyed by query embedding.
+
+    A lookup hits when a cached query's cosine similarity (inner product of
+    unit vectors) reaches ``threshold``; the least recently used slot is
+    evicted once ``capacity`` entries are held. Vectors are kept as int8
+    (a quarter of the float32 footprint) and compared with int32 dot products.
+    """
+
+    def __init__(self, capacity, threshold):
+        self.capacity = capacity
+        self.threshold = threshold
+        self._int_threshold = threshold * _QUANT_SCALE * _QUANT_SCALE
+        self._vectors = None
+        self._entries = []
+        self._last_used = np.zeros(max(capacity, 0), dtype=np.int64)
+        self._tick = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _quantize(vec):
+        return np.clip(np.rint(vec * _QUANT_SCALE), -_QUANT_SCALE, _QUANT_SCALE).astype(np.int8)
+
+    def get(self, query_vec, top_k):
+        query_q = self._quantize(query_vec)
+        with self._lock:
+            if not self._entries:
+                return None
+            sims = np.matmul(self._vectors[:len(self._entries)], query_q, dtype=np.int32)
+            slot = int(sims.argmax())
+            cached_top_k, results = self._entries[slot]
+            if sims[slot] < self._int_threshold or cached_top_k < top_k:
+                return None
+            self._tick += 1
+            self._last_used[slot] = self._tick
+            return results[:top_k]
+
+    def put(self, query_vec, top_k, results):
+        if self.capacity <= 0:
+            # RAG_CACHE_SIZE=0 disables the cache
+            return
+        query_q = self._quantize(query_vec)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.capacity, query_q.shape[0]), dtype=np.int8)
+            if len(self._entries) < self.capacity:
+                slot = len(self._entries)
+                self._entries.append((top_k, results))
+            else:
+                slot = int(self._last_used.argmin())
+                self._entries[slot] = (top_k, results)
+            self._vectors[slot] = query_q
+            self._tick += 1
+            self._last_used[slot] = self._tick
 
 
 class RAGRetriever:
     def __init__(self):
-        self.client = chromadb.PersistentClient(path=CHROMA_DIR)
-        self.embedder = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="all-MiniLM-L6-v2"
-        )
+        if CHROMA_HOST:
+            # Separate server process: HNSW inserts and index memory stay out of the API
+            self.client = chromadb.HttpClient(host=CHROMA_HOST, port=CHROMA_PORT)
+        else:
+            self.client = chromadb.PersistentClient(path=CHROMA_DIR)
+        # Embeddings are computed here in batches (on GPU/MPS when available)
+        # and handed to Chroma, so the collection carries no embedding function.
+        self.model = SentenceTransformer("all-MiniLM-L6-v2", device=EMBEDDING_DEVICE)
         self.collection = self.client.get_or_create_collection(
             name="sar_corpus",
-            embedding_function=self.embedder,
+            embedding_function=None,
+        )
+        self.cache = SemanticCache(RAG_CACHE_SIZE, RAG_CACHE_THRESHOLD)
+
+    def _embed(self, texts):
+        return self.model.encode(
+            texts,
+            batch_size=64,
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
         )
 
     def load_corpus(self, corpus_dir=None):
         corpus_path = Path(corpus_dir or CORPUS_DIR)
+        # Read, embed and upsert in fixed-size batches so peak memory stays
+        # bounded and Chroma never sees one giant upsert.
         docs = []
         ids = []
-        for idx, path in enumerate(sorted(corpus_path.glob("*.txt"))):
+        for path in sorted(corpus_path.glob("*.txt")):
             docs.append(path.read_text(encoding="utf-8"))
             ids.append(path.stem)
+            if len(docs) == UPSERT_BATCH_SIZE:
+                self._upsert(docs, ids)
+                docs, ids = [], []
         if docs:
-            self.collection.upsert(documents=docs, ids=ids)
+            self._upsert(docs, ids)
+
+    def _upsert(self, docs, ids):
+        embeddings = self._embed(docs)
+        self.collection.upsert(documents=docs, ids=ids, embeddings=embeddings.tolist())
 
     def retrieve(self, query, top_k=4):
         if not query:
             return []
-        res = self.collection.query(query_texts=[query], n_results=top_k)
+        query_embedding = self._embed([query])
+        cached = self.cache.get(query_embedding[0], top_k)
+        if cached is not None:
+            return cached
+        res = self.collection.query(query_embeddings=query_embedding.tolist(), n_results=top_k)
         docs = res.get("documents", [[]])[0]
         ids = res.get("ids", [[]])[0]
         distances = res.get("distances", [[]])[0]
@@ -41,4 +142,18 @@ class RAGRetriever:
                 "text": doc,
                 "similarity": round(1 - dist, 4) if dist is not None else None,
             })
+        self.cache.put(query_embedding[0], top_k, results)
         return results
+
+
+def get_retriever():
+    """Return the process-wide retriever, loading and warming the model on first use."""
+    global _instance
+    if _instance is None:
+        with _instance_lock:
+            if _instance is None:
+                retriever = RAGRetriever()
+                # First encode pays for lazy weight loading and kernel setup
+                retriever._embed(["warmup"])
+                _instance = retriever
+    return _instance
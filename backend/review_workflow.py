@@ -1,20 +1,21 @@
 """Review workflow utilities for investigator lifecycle."""
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, FrozenSet, List
 
 VALID_STATES = ["DRAFT", "REVIEW", "APPROVED", "SUBMITTED", "REJECTED", "VALIDATION_FAILED"]
-TRANSITIONS = {
-    "DRAFT": ["REVIEW", "VALIDATION_FAILED"],
-    "REVIEW": ["APPROVED", "REJECTED"],
-    "APPROVED": ["SUBMITTED"],
-    "REJECTED": ["DRAFT"],
-    "VALIDATION_FAILED": ["DRAFT"],
+TRANSITIONS: Dict[str, FrozenSet[str]] = {
+    "DRAFT": frozenset({"REVIEW", "VALIDATION_FAILED"}),
+    "REVIEW": frozenset({"APPROVED", "REJECTED"}),
+    "APPROVED": frozenset({"SUBMITTED"}),
+    "REJECTED": frozenset({"DRAFT"}),
+    "VALIDATION_FAILED": frozenset({"DRAFT"}),
 }
+_EMPTY: FrozenSet[str] = frozenset()
 
 
 def can_transition(current: str, target: str) -> bool:
-    return target in TRANSITIONS.get(current, [])
+    return target in TRANSITIONS.get(current, _EMPTY)
 
 
 def record_history(history: List[Dict[str, str]] | None, user: str, action: str, comment: str | None) -> List[Dict[str, str]]:
@@ -63,8 +63,8 @@ def assess_risk(decision_data: dict, evidence_blocks: list) -> RiskAssessment:
     # Structuring: smaller frequent txns vs total
     structuring_score = 0.0
     if txns:
-        small = [t for t in txns if t.get("amount", 0) < 10000]
-        structuring_score = min(30.0, (len(small) / len(txns)) * 30.0)
+        small_count = sum(1 for t in txns if t.get("amount", 0) < 10000)
+        structuring_score = min(30.0, (small_count / len(txns)) * 30.0)
 
     # Jurisdiction risk: count high-risk corridors flagged by rules
     high_risk_rules = {b["rule_id"] for b in evidence_blocks if "AML-021" in b.get("rule_id", "")}
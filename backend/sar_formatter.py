@@ -18,6 +18,11 @@ SECTION_ORDER = [
     "Conclusion & Recommendation",
 ]
 
+# (display title, snake_case key the LLM returns) for each section, in order
+_SECTION_KEYS = tuple(
+    (section, section.lower().replace(" ", "_").replace("&", "and")) for section in SECTION_ORDER
+)
+
 
 def _as_paragraph(text: str) -> str:
     text = (text or "").strip()
@@ -34,8 +39,7 @@ def format_sar_narrative(
 ) -> Dict[str, object]:
     """Produce ordered SAR sections with metadata for downstream export."""
     sections = {}
-    for section in SECTION_ORDER:
-        key = section.lower().replace(" ", "_").replace("&", "and")
+    for section, key in _SECTION_KEYS:
         sections[section] = _as_paragraph(llm_sections.get(key) or llm_sections.get(section) or "")
 
     return {
@@ -50,10 +54,7 @@ def format_sar_narrative(
 
 def narrative_as_text(formatted: Dict[str, object]) -> str:
     """Render formatted SAR narrative to a plain-text multi-section document."""
-    parts: List[str] = []
-    for section in SECTION_ORDER:
-        body = formatted.get("sections", {}).get(section, "")
-        parts.append(f"{section}\n{body}\n")
+    sections = formatted.get("sections", {})
+    body = "\n".join(f"{section}\n{sections.get(section, '')}\n" for section in SECTION_ORDER)
     meta = f"Risk Level: {formatted.get('risk_level')} | Risk Score: {formatted.get('risk_score')} | Confidence: {formatted.get('confidence_level')}"
-    parts.append(meta)
-    return "\n".join(parts)
+    return f"{body}\n{meta}"
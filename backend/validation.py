@@ -2,6 +2,11 @@ import re
 
 from .config import PROHIBITED_PHRASES
 
+try:
+    import ahocorasick
+except ImportError:  # optional; the regex alternation handles short phrase lists
+    ahocorasick = None
+
 REQUIRED_FIELDS = [
     "subject_summary",
     "suspicious_activity_description",
@@ -12,16 +17,67 @@ REQUIRED_FIELDS = [
     "reason_for_suspicion",
     "reporting_justification",
 ]
+_REQUIRED_SET = frozenset(REQUIRED_FIELDS)
+
+# One case-insensitive alternation scans the narrative once for every phrase;
+# longest phrases first so an overlapping shorter phrase cannot shadow them.
+_PROHIBITED_RE = re.compile(
+    r"\b(?:" + "|".join(re.escape(p) for p in sorted(PROHIBITED_PHRASES, key=len, reverse=True)) + r")\b",
+    re.IGNORECASE,
+)
+
+# From this many phrases on, an Aho-Corasick automaton (O(text + matches),
+# independent of phrase count) is used instead of the alternation.
+AHOCORASICK_MIN_PHRASES = 50
+
+
+def _build_automaton(phrases):
+    automaton = ahocorasick.Automaton()
+    for phrase in phrases:
+        automaton.add_word(phrase.lower(), phrase.lower())
+    automaton.make_automaton()
+    return automaton
+
+
+_PROHIBITED_AC = (
+    _build_automaton(PROHIBITED_PHRASES)
+    if ahocorasick is not None and len(PROHIBITED_PHRASES) >= AHOCORASICK_MIN_PHRASES
+    else None
+)
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def _find_prohibited(text):
+    """Return the lower-cased prohibited phrases occurring as whole words in ``text``."""
+    if _PROHIBITED_AC is None:
+        return {m.group(0).lower() for m in _PROHIBITED_RE.finditer(text)}
+    lowered = text.lower()
+    found = set()
+    for end, phrase in _PROHIBITED_AC.iter(lowered):
+        start = end - len(phrase) + 1
+        # Same word boundaries as the regex's \b on either side
+        if start > 0 and _is_word_char(lowered[start - 1]):
+            continue
+        if end + 1 < len(lowered) and _is_word_char(lowered[end + 1]):
+            continue
+        found.add(phrase)
+    return found
 
 
 def validate_narrative(narrative, evidence_blocks):
     errors = []
     warnings = []
 
+    missing_fields = _REQUIRED_SET - narrative.keys()
+    if missing_fields:
+        # Report in REQUIRED_FIELDS order so error lists are stable
+        errors.extend(f"Missing field: {field}" for field in REQUIRED_FIELDS if field in missing_fields)
     for field in REQUIRED_FIELDS:
-        if field not in narrative:
-            errors.append(f"Missing field: {field}")
-        elif isinstance(narrative[field], str) and not narrative[field].strip():
+        value = narrative.get(field)
+        if isinstance(value, str) and not value.strip():
             errors.append(f"Empty field: {field}")
 
     # Evidence traceability
@@ -37,9 +93,10 @@ def validate_narrative(narrative, evidence_blocks):
             str(narrative.get(k, ""))
             for k in REQUIRED_FIELDS
         ]
-    ).lower()
+    )
+    found = _find_prohibited(joined)
     for phrase in PROHIBITED_PHRASES:
-        if re.search(r"\b" + re.escape(phrase) + r"\b", joined):
+        if phrase.lower() in found:
             warnings.append(f"Prohibited phrase found: {phrase}")
 
     return {
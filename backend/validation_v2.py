@@ -1,6 +1,7 @@
 """Regulatory validation v2 with expanded checks."""
 from __future__ import annotations
 
+import re
 from typing import Dict, List
 
 REQUIRED_SECTIONS = [
@@ -15,6 +16,9 @@ REQUIRED_SECTIONS = [
     "Conclusion & Recommendation",
 ]
 
+# Crude PII heuristic: a whitespace-delimited token of six or more digits
+_PII_RE = re.compile(r"(?<!\S)\d{6,}(?!\S)")
+
 
 def validate_v2(formatted_narrative: Dict[str, object], explainability_trace: List[dict]) -> Dict[str, object]:
     errors: List[str] = []
@@ -31,8 +35,13 @@ def validate_v2(formatted_narrative: Dict[str, object], explainability_trace: Li
     if not citations:
         errors.append("No evidence citations provided")
 
-    # Each trace entry should have evidence mapping
-    missing_evidence = [t for t in explainability_trace if not t.get("supporting_evidence_id")]
+    # One pass over the trace: covered sections and whether any entry lacks an evidence id
+    covered = set()
+    missing_evidence = False
+    for t in explainability_trace:
+        covered.add(t.get("section"))
+        if not t.get("supporting_evidence_id"):
+            missing_evidence = True
     if missing_evidence:
         warnings.append("Some statements lack evidence ids")
 
@@ -41,14 +50,12 @@ def validate_v2(formatted_narrative: Dict[str, object], explainability_trace: Li
         text_str = str(text)
         if len(text_str) < 40:
             warnings.append(f"Narrative clarity low in section: {sec}")
-        if len(text_str) > 0 and any(char.isdigit() for char in text_str) and len(text_str) > 6:
-            # crude PII detection heuristic
-            if any(token.isdigit() and len(token) >= 6 for token in text_str.split()):
-                warnings.append(f"Possible unmasked PII detected in {sec}")
+        if len(text_str) > 6 and _PII_RE.search(text_str):
+            warnings.append(f"Possible unmasked PII detected in {sec}")
 
     # Minimum explanation coverage: ensure each section has at least one trace entry
     for sec in REQUIRED_SECTIONS:
-        if not any(t.get("section") == sec for t in explainability_trace):
+        if sec not in covered:
             warnings.append(f"No explainability coverage for {sec}")
 
     passed = len(errors) == 0
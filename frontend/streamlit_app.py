@@ -1,26 +1,84 @@
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from urllib3.util.retry import Retry
 
 API_BASE = os.getenv("API_BASE", "http://localhost:8000")
 
 st.set_page_config(page_title="SAR Narrative Generator", layout="wide")
 
 
+@st.cache_resource(show_spinner=False)
+def _http_session():
+    # Cached across reruns so API calls reuse pooled keep-alive connections.
+    # Retry only covers idempotent methods (not POST).
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=Retry(total=2, backoff_factor=0.1))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+
+SESSION = _http_session()
+
+
+@st.cache_resource(show_spinner=False)
+def _fetch_pool():
+    # One pool for every session and rerun instead of spawning threads per rerun
+    return ThreadPoolExecutor(max_workers=8, thread_name_prefix="api-fetch")
+
+
+def submit_fetch(fn, *args):
+    # Worker threads need the caller's script context for st.cache_data
+    script_ctx = get_script_run_ctx()
+
+    def run():
+        add_script_run_ctx(threading.current_thread(), script_ctx)
+        return fn(*args)
+
+    return _fetch_pool().submit(run)
+
+
 def fetch_cases():
     try:
-        return requests.get(f"{API_BASE}/cases", timeout=30).json()
+        return SESSION.get(f"{API_BASE}/cases", timeout=30).json()
     except Exception:
         return []
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def fetch_case(case_id: str):
-    return requests.get(f"{API_BASE}/cases/{case_id}", timeout=30).json()
+    return SESSION.get(f"{API_BASE}/cases/{case_id}", timeout=30).json()
 
 
+@st.cache_data(ttl=30, show_spinner=False)
 def fetch_audit(case_id: str):
-    return requests.get(f"{API_BASE}/cases/{case_id}/audit", timeout=30).json()
+    return SESSION.get(f"{API_BASE}/cases/{case_id}/audit", timeout=30).json()
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_export_pdf(case_id: str):
+    return SESSION.get(f"{API_BASE}/cases/{case_id}/export/pdf", timeout=60).content
+
+
+@st.cache_data(ttl=300, show_spinner=False)
+def fetch_export_json(case_id: str):
+    return json.dumps(SESSION.get(f"{API_BASE}/cases/{case_id}/export/json", timeout=60).json())
+
+
+def refresh_case_views():
+    fetch_case.clear()
+    fetch_audit.clear()
+    fetch_export_pdf.clear()
+    fetch_export_json.clear()
+    st.experimental_rerun()
 
 
 st.sidebar.header("Case Controls")
@@ -36,7 +94,7 @@ selected_case_id = st.sidebar.selectbox("Select case", options=[""].__add__([c["
 
 if run_generation and uploaded is not None:
     alert_json = json.load(uploaded)
-    resp = requests.post(f"{API_BASE}/ingest-alert", json=alert_json, timeout=300)
+    resp = SESSION.post(f"{API_BASE}/ingest-alert", json=alert_json, timeout=300)
     if resp.ok:
         st.sidebar.success(f"Case created: {resp.json().get('case_id')} — refresh to view")
         st.session_state.pop("cases", None)
@@ -44,6 +102,12 @@ if run_generation and uploaded is not None:
         st.sidebar.error(resp.text)
 
 
+# Fetch the case and its audit trail concurrently once per rerun; tabs share the results
+if selected_case_id:
+    case_future = submit_fetch(fetch_case, selected_case_id)
+    audit_future = submit_fetch(fetch_audit, selected_case_id)
+
+
 tab_upload, tab_sar, tab_evidence, tab_risk, tab_validation, tab_audit = st.tabs([
     "Upload Alert",
     "Generated SAR",
@@ -62,7 +126,7 @@ with tab_upload:
 with tab_sar:
     st.markdown("### Generated SAR Narrative")
     if selected_case_id:
-        case = fetch_case(selected_case_id)
+        case = case_future.result()
         st.markdown(f"**Status:** {case.get('status')} | **Risk:** {case.get('risk_level')} ({case.get('risk_score')}) | **Confidence:** {round(case.get('confidence_level', 0),2)}")
 
         sections = (case.get("draft_narrative") or {}).get("sections", {})
@@ -76,20 +140,30 @@ with tab_sar:
         colA, colB, colC = st.columns(3)
         with colA:
             if st.button("Submit for Review"):
-                res = requests.post(f"{API_BASE}/cases/{selected_case_id}/submit", json={"user": "analyst"}, timeout=30)
-                st.experimental_rerun() if res.ok else st.error(res.text)
+                res = SESSION.post(f"{API_BASE}/cases/{selected_case_id}/submit", json={"user": "analyst"}, timeout=30)
+                refresh_case_views() if res.ok else st.error(res.text)
         with colB:
             if st.button("Approve"):
                 payload = {"comment": "Approved via UI", "role": "analyst", "narrative": case.get("draft_narrative")}
-                res = requests.post(f"{API_BASE}/cases/{selected_case_id}/approve", json=payload, timeout=30)
-                st.experimental_rerun() if res.ok else st.error(res.text)
+                res = SESSION.post(f"{API_BASE}/cases/{selected_case_id}/approve", json=payload, timeout=30)
+                refresh_case_views() if res.ok else st.error(res.text)
         with colC:
             if st.button("Finalize & Submit"):
-                res = requests.post(f"{API_BASE}/cases/{selected_case_id}/finalize", json={"user": "approver"}, timeout=30)
-                st.experimental_rerun() if res.ok else st.error(res.text)
-
-        st.download_button("Download PDF", data=requests.get(f"{API_BASE}/cases/{selected_case_id}/export/pdf").content, file_name=f"{selected_case_id}.pdf")
-        st.download_button("Download JSON", data=json.dumps(requests.get(f"{API_BASE}/cases/{selected_case_id}/export/json").json()), file_name=f"{selected_case_id}.json")
+                res = SESSION.post(f"{API_BASE}/cases/{selected_case_id}/finalize", json={"user": "approver"}, timeout=30)
+                refresh_case_views() if res.ok else st.error(res.text)
+
+        # Exports are only fetched once requested, not on every rerun
+        colPdf, colJson = st.columns(2)
+        with colPdf:
+            if st.button("Prepare PDF"):
+                st.session_state["pdf_ready"] = selected_case_id
+            if st.session_state.get("pdf_ready") == selected_case_id:
+                st.download_button("Download PDF", data=fetch_export_pdf(selected_case_id), file_name=f"{selected_case_id}.pdf")
+        with colJson:
+            if st.button("Prepare JSON"):
+                st.session_state["json_ready"] = selected_case_id
+            if st.session_state.get("json_ready") == selected_case_id:
+                st.download_button("Download JSON", data=fetch_export_json(selected_case_id), file_name=f"{selected_case_id}.json")
     else:
         st.info("Select a case from the sidebar to view the SAR narrative.")
 
@@ -97,7 +171,7 @@ with tab_sar:
 with tab_evidence:
     st.markdown("### Evidence Explorer")
     if selected_case_id:
-        case = fetch_case(selected_case_id)
+        case = case_future.result()
         evidence = case.get("evidence_data", {})
         trace = case.get("explainability_trace", [])
         st.subheader("Evidence Blocks")
@@ -111,7 +185,7 @@ with tab_evidence:
 with tab_risk:
     st.markdown("### Risk Dashboard")
     if selected_case_id:
-        case = fetch_case(selected_case_id)
+        case = case_future.result()
         st.metric(label="Risk Score", value=round(case.get("risk_score", 0), 2), delta=case.get("risk_level"))
         factors = (case.get("draft_narrative") or {}).get("contributing_factors") or {}
         if factors:
@@ -123,7 +197,7 @@ with tab_risk:
 with tab_validation:
     st.markdown("### Validation Report")
     if selected_case_id:
-        case = fetch_case(selected_case_id)
+        case = case_future.result()
         validation = case.get("validation_v2_results") or {}
         st.json(validation)
     else:
@@ -133,7 +207,7 @@ with tab_validation:
 with tab_audit:
     st.markdown("### Audit Timeline")
     if selected_case_id:
-        audit = fetch_audit(selected_case_id)
+        audit = audit_future.result()
         for ev in audit.get("timeline", []):
             st.markdown(f"**{ev['event_type']}** {ev['timestamp']}")
             with st.expander("View payload"):
@@ -1,8 +1,8 @@
-from backend.rag import RAGRetriever
+from backend.rag import get_retriever
 
 
 def main():
-    retriever = RAGRetriever()
+    retriever = get_retriever()
     retriever.load_corpus()
     print("Seeded ChromaDB corpus")
 
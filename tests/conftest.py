@@ -0,0 +1,7 @@
+import os
+import tempfile
+
+# backend.config reads these at import time; point the app at a throwaway
+# database and the mock LLM before any test imports it.
+os.environ["DB_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ["USE_MOCK_LLM"] = "true"
@@ -0,0 +1,40 @@
+import pytest
+
+pytest.importorskip("chromadb")
+pytest.importorskip("sentence_transformers")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from backend import main  # noqa: E402
+
+PIPELINE_EVENTS = ["ENRICHED", "RULE_TRIGGERED", "RISK_ASSESSED", "EVIDENCE_BUILT", "RETRIEVAL_COMPLETE"]
+
+
+class _EmptyRetriever:
+    def load_corpus(self):
+        pass
+
+    def retrieve(self, query, top_k=4):
+        return []
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(main, "get_retriever", _EmptyRetriever)
+    main._cached_retrieve.cache_clear()
+    with TestClient(main.app) as test_client:
+        yield test_client
+
+
+def test_failed_batch_case_keeps_pipeline_audit_events(client):
+    # No transactions -> no rules fire -> the hallucination guard fails the
+    # case after every pipeline stage has queued its event
+    result = client.post("/batch-ingest", json={"alerts": [{"transactions": []}]}).json()["results"][0]
+    assert result["status"] == "ERROR"
+
+    timeline = client.get(f"/cases/{result['case_id']}/audit").json()["timeline"]
+    events = [e["event_type"] for e in timeline]
+    assert events[0] == "INGESTED"
+    assert events[-1] == "ERROR"
+    for event_type in PIPELINE_EVENTS:
+        assert event_type in events
@@ -0,0 +1,26 @@
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.pdf_exporter import FONT_DIR, SarPDF
+
+# Different glyph sets and page counts per document, so any font state leaking
+# between documents changes the output
+TEXTS = ["Héllo wörld ☃ " * k + "Ωmega αβγ " * (8 - k) for k in range(8)]
+
+
+def _render(i):
+    pdf = SarPDF(f"CASE-{i}", "Org", "2024-01-01 00:00:00 UTC", FONT_DIR)
+    pdf.set_creation_date(dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc))
+    for _ in range(i % 3 + 1):
+        pdf.add_page()
+        pdf.set_font("DejaVu", "", 11)
+        pdf.multi_cell(0, 6, TEXTS[i] * 20)
+    return bytes(pdf.output())
+
+
+def test_concurrent_pdfs_match_sequential_output():
+    expected = [_render(i) for i in range(len(TEXTS))]
+    for _ in range(3):
+        with ThreadPoolExecutor(max_workers=len(TEXTS)) as pool:
+            results = list(pool.map(_render, range(len(TEXTS))))
+        assert results == expected